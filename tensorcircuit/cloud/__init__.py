@@ -1,5 +1,14 @@
+from typing import Any
+
 from . import apis
 from . import abstraction
 from . import wrapper
 from .wrapper import batch_expectation_ps
 from .apis import submit_task
+
+
+def __getattr__(name: str) -> Any:
+    # backward compatible aliases of the default provider and device
+    if name in ["default_provider", "default_device"]:
+        return getattr(apis, name)
+    raise AttributeError("module %s has no attribute %s" % (__name__, name))
@@ -2,40 +2,169 @@
 main entrypoints of cloud module
 """
 
-from typing import Any, List, Optional, Dict, Union, Tuple
-from base64 import b64decode, b64encode
-from functools import partial
+from typing import (
+    Any,
+    Callable,
+    List,
+    Literal,
+    Optional,
+    Dict,
+    Set,
+    Union,
+    Tuple,
+    overload,
+)
+from base64 import b64decode
+from functools import partial, lru_cache
 import json
 import os
-import sys
 import logging
+import tempfile
+from types import ModuleType
 
 from .abstraction import Provider, Device, Task, sep, sep2
 
+try:
+    import orjson  # type: ignore
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads  # type: ignore
+
+    def _json_dumps(obj: Any) -> bytes:  # type: ignore
+        return json.dumps(obj).encode("utf-8")
+
+
 logger = logging.getLogger(__name__)
 
+# provider name -> backend module implementing the cloud apis
+_BACKENDS: Dict[str, ModuleType] = {}
+# provider name -> cloud apis the backend module actually supports
+_CAPS: Dict[str, Set[str]] = {
+    "tencent": {
+        "list_devices",
+        "list_properties",
+        "get_task_details",
+        "submit_task",
+        "resubmit_task",
+        "remove_task",
+        "list_tasks",
+    },
+    "local": {"list_devices", "get_task_details", "submit_task", "list_tasks"},
+    "quafu": {"get_task_details", "submit_task"},
+}
 
 try:
     from . import tencent  # type: ignore
+
+    _BACKENDS["tencent"] = tencent
 except (ImportError, ModuleNotFoundError):
     logger.warning("fail to load cloud provider module: tencent")
 
 try:
     from . import local
+
+    _BACKENDS["local"] = local
 except (ImportError, ModuleNotFoundError):
     logger.warning("fail to load cloud provider module: local")
 
 try:
     from . import quafu_provider
+
+    _BACKENDS["quafu"] = quafu_provider
 except (ImportError, ModuleNotFoundError):
     pass
     # logger.warning("fail to load cloud provider module: quafu")
 
-package_name = "tensorcircuit"
-thismodule = sys.modules[__name__]
+
+@lru_cache(maxsize=None)
+def _provider(name: str) -> Provider:
+    """
+    memoized ``Provider.from_name`` for provider given as str,
+    call ``_provider.cache_clear()`` if providers are registered dynamically
+    """
+    return Provider.from_name(name)
+
+
+@lru_cache(maxsize=None)
+def _device(name: str, provider_name: Optional[str] = None) -> Device:
+    """
+    memoized ``Device.from_name`` for device given as str
+    """
+    return Device.from_name(name, provider_name)
+
+
+def _as_provider(provider: Union[str, Provider]) -> Provider:
+    """
+    Resolve ``provider`` to a ``Provider`` object, short-circuit if it is already one
+    """
+    if isinstance(provider, Provider):
+        return provider
+    return _provider(provider)
+
+
+def _as_device(
+    device: Union[str, Device], provider: Optional[Union[str, Provider]] = None
+) -> Device:
+    """
+    Resolve ``device`` to a ``Device`` object, short-circuit if it is already one
+    """
+    if isinstance(device, Device):
+        return device
+    if isinstance(provider, Provider):
+        provider = provider.name
+    return _device(device, provider)
+
+
+class _State:
+    """
+    Mutable state shared by reference across the cloud module,
+    i.e. the default provider and device, both initialized lazily at the first access
+    """
+
+    def __init__(self) -> None:
+        self._provider: Optional[Provider] = None
+        self._device: Optional[Device] = None
+
+    @property
+    def provider(self) -> Provider:
+        if self._provider is None:
+            self._provider = _provider("tencent")
+        return self._provider
+
+    @provider.setter
+    def provider(self, provider: Provider) -> None:
+        self._provider = provider
+
+    @property
+    def device(self) -> Device:
+        if self._device is None:
+            self._device = _device("tencent::simulator:tc")
+        return self._device
+
+    @device.setter
+    def device(self, device: Device) -> None:
+        self._device = device
+
+
+STATE = _State()
+
+# ``saved_token`` is only declared here and loaded lazily at the first access
+saved_token: Dict[str, Any]
+
+
+def __getattr__(name: str) -> Any:
+    # backward compatible module attributes, forwarded to the lazy shared state
+    if name == "default_provider":
+        return STATE.provider
+    if name == "default_device":
+        return STATE.device
+    if name == "saved_token":
+        return _ensure_tokens_loaded()
+    raise AttributeError("module %s has no attribute %s" % (__name__, name))
 
 
-default_provider = Provider.from_name("tencent")
 avail_providers = ["tencent", "local"]
 
 
@@ -64,20 +193,15 @@ def set_provider(
     :rtype: Provider
     """
     if provider is None:
-        provider = default_provider
-    provider = Provider.from_name(provider)
+        provider = STATE.provider
+    provider = _as_provider(provider)
     if set_global:
-        for module in sys.modules:
-            if module.startswith(package_name):
-                setattr(sys.modules[module], "default_provider", provider)
+        STATE.provider = provider
     return provider
 
 
-set_provider()
 get_provider = partial(set_provider, set_global=False)
 
-default_device = Device.from_name("tencent::simulator:tc")
-
 
 def set_device(
     provider: Optional[Union[str, Provider]] = None,
@@ -102,44 +226,162 @@ def set_device(
     if device is None and provider is not None:
         raise ValueError("Please specify the device apart from the provider")
     if device is None:
-        device = default_device
-
-    if isinstance(device, str):
-        if len(device.split(sep)) > 1:
-            provider, device = device.split(sep)
-            provider = Provider.from_name(provider)
-            device = Device.from_name(device, provider)
-        else:
-            if provider is None:
-                provider = get_provider()
-            provider = Provider.from_name(provider)
-            device = Device.from_name(device, provider)
-    else:
-        if provider is None:
-            provider = get_provider()
-        provider = Provider.from_name(provider)
-        device = Device.from_name(device, provider)
+        device = STATE.device
+    # the provider prefix in device str, if any, takes precedence in ``_as_device``
+    device = _as_device(device, STATE.provider if provider is None else provider)
 
     if set_global:
-        for module in sys.modules:
-            if module.startswith(package_name):
-                setattr(sys.modules[module], "default_device", device)
+        STATE.device = device
     return device
 
 
-set_device()
 get_device = partial(set_device, set_global=False)
 
 
-def b64encode_s(s: str) -> str:
-    return b64encode(s.encode("utf-8")).decode("utf-8")
+def b64decode_s(s: str) -> str:
+    # ``b64decode`` accepts ascii str directly, no need to encode it first
+    return b64decode(s).decode("utf-8")
 
 
-def b64decode_s(s: str) -> str:
-    return b64decode(s.encode("utf-8")).decode("utf-8")
+def _backend_method(provider: Provider, method: str) -> Callable[..., Any]:
+    """
+    Get the implementation of ``method`` from the backend module of ``provider``
+
+    :param provider: the cloud provider
+    :type provider: Provider
+    :param method: name of the api, e.g. "submit_task"
+    :type method: str
+    :raises ValueError: if the provider or the method is not supported
+    :return: the backend function
+    :rtype: Callable[..., Any]
+    """
+    mod = _BACKENDS.get(provider.name)
+    if mod is None:
+        raise ValueError("Unsupported provider: %s" % provider.name)
+    if method not in _CAPS.get(provider.name, set()):
+        raise ValueError("Unsupported method for %s backend" % provider.name)
+    return getattr(mod, method)  # type: ignore
+
+
+# snapshot of the tokens last loaded from or written to the disk,
+# the token file is only rewritten when ``saved_token`` differs from it
+_disk_tokens: Optional[Dict[str, Any]] = None
+
+
+# token json structure, saved in ``~/.tc.auth.v2.json``
+# {"version": 2, "tokens": {"tencent::": token1, "tencent::20xmon":  token2}}
+# legacy files ``~/.tc.auth.json`` store the base64 encoded token dict directly
+# without "version" key, they are only read as a fallback and never rewritten,
+# so that they keep working for older tensorcircuit installations
+token_file_version = 2
+
+
+def _token_path() -> str:
+    homedir = os.path.expanduser("~")
+    return os.path.join(homedir, ".tc.auth.v2.json")
+
+
+def _legacy_token_path() -> str:
+    homedir = os.path.expanduser("~")
+    return os.path.join(homedir, ".tc.auth.json")
+
+
+def _dump_tokens(tokens: Dict[str, Any]) -> None:
+    """
+    Write the tokens to the disk atomically,
+    i.e. via a temporary file in the same directory which then replaces the token file
+
+    :param tokens: token dict
+    :type tokens: Dict[str, Any]
+    """
+    global _disk_tokens
+    authpath = _token_path()
+    f = tempfile.NamedTemporaryFile(
+        "wb", dir=os.path.dirname(authpath), prefix=".tc.auth.", delete=False
+    )
+    try:
+        with f:
+            f.write(_json_dumps({"version": token_file_version, "tokens": tokens}))
+        os.replace(f.name, authpath)
+    except BaseException:
+        os.remove(f.name)
+        raise
+    _disk_tokens = dict(tokens)
+
+
+def _parse_tokens(file_token: Any) -> Dict[str, Any]:
+    """
+    Extract the token dict from the json content of the token file
+
+    :param file_token: json content of the token file
+    :type file_token: Any
+    :return: token dict, empty if the content is invalid or of unknown version
+    :rtype: Dict[str, Any]
+    """
+    if not isinstance(file_token, dict):
+        logger.warning("invalid token file, set empty token instead")
+        return {}
+    if "version" not in file_token:
+        # legacy token file with base64 encoded tokens
+        try:
+            return {k: b64decode_s(v) for k, v in file_token.items()}
+        except (ValueError, TypeError):
+            logger.warning("invalid legacy token file, set empty token instead")
+            return {}
+    if file_token["version"] != token_file_version:
+        logger.warning(
+            "unsupported token file version %s, set empty token instead"
+            % file_token["version"]
+        )
+        return {}
+    tokens = file_token.get("tokens", {})
+    if not isinstance(tokens, dict):
+        logger.warning("invalid token file, set empty token instead")
+        return {}
+    return tokens
+
+
+def _load_tokens() -> Dict[str, Any]:
+    """
+    Load the tokens saved on the disk,
+    the legacy token file is used if no token file of the current format is found
 
+    :return: token dict, empty if no token file is found
+    :rtype: Dict[str, Any]
+    """
+    global _disk_tokens
+    authpath = _token_path()
+    legacy = False
+    if not os.path.exists(authpath):
+        authpath = _legacy_token_path()
+        legacy = True
+        if not os.path.exists(authpath):
+            return {}
+    try:
+        with open(authpath, "rb") as f:
+            file_token = _json_loads(f.read())
+    # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+    except json.JSONDecodeError:
+        logger.warning("token file loading failure, set empty token instead")
+        # TODO(@refraction-ray): better conflict solve with multiprocessing
+        return {}
+    tokens = _parse_tokens(file_token)
+    if not legacy:
+        _disk_tokens = dict(tokens)
+    return tokens
+
+
+def _ensure_tokens_loaded() -> Dict[str, Any]:
+    """
+    Load the tokens saved on the disk at the first call, and memoize them afterwards
 
-saved_token: Dict[str, Any] = {}
+    :return: the saved token dict
+    :rtype: Dict[str, Any]
+    """
+    global saved_token
+    if "saved_token" not in globals():
+        saved_token = _load_tokens()
+    return saved_token
 
 
 def _preprocess(
@@ -159,19 +401,67 @@ def _preprocess(
     if provider is not None and device is None:
         provider, device = None, provider
     if device is None:
-        device = get_device()
-    if isinstance(device, str):
-        if len(device.split(sep)) > 1:
-            device = Device.from_name(device, provider)
-        else:
-            if provider is None:
-                provider = get_provider()
-            device = Device.from_name(device, provider)
+        device = STATE.device
+    device = _as_device(device, STATE.provider if provider is None else provider)
     if provider is None:
-        provider = device.provider
-    if isinstance(provider, str):
-        provider = Provider.from_name(provider)
-    return provider, device  # type: ignore
+        return device.provider, device
+    return _as_provider(provider), device
+
+
+@overload
+def _resolve(
+    provider: Optional[Union[str, Provider]] = None,
+    device: Optional[Union[str, Device]] = None,
+    token: Optional[str] = None,
+    *,
+    require_device: Literal[True] = True,
+) -> Tuple[Provider, Device, Optional[str]]:
+    ...
+
+
+@overload
+def _resolve(
+    provider: Optional[Union[str, Provider]] = None,
+    device: Optional[Union[str, Device]] = None,
+    token: Optional[str] = None,
+    *,
+    require_device: Literal[False],
+) -> Tuple[Provider, Optional[Device], Optional[str]]:
+    ...
+
+
+def _resolve(
+    provider: Optional[Union[str, Provider]] = None,
+    device: Optional[Union[str, Device]] = None,
+    token: Optional[str] = None,
+    *,
+    require_device: bool = True,
+) -> Tuple[Provider, Optional[Device], Optional[str]]:
+    """
+    Normalize the provider, device and token arguments shared by the cloud apis
+
+    :param provider: _description_, defaults to None
+    :type provider: Optional[Union[str, Provider]], optional
+    :param device: _description_, defaults to None
+    :type device: Optional[Union[str, Device]], optional
+    :param token: _description_, defaults to None
+    :type token: Optional[str], optional
+    :param require_device: whether the api runs on a specific device, defaults to True,
+        if False, ``device`` is kept None when not given and ``token`` falls back
+        to the provider one
+    :type require_device: bool, optional
+    :return: the resolved provider, device and token
+    :rtype: Tuple[Provider, Optional[Device], Optional[str]]
+    """
+    if require_device:
+        p, d = _preprocess(provider, device)
+        if token is None:
+            token = d.get_token()
+        return p, d, token
+    p = _as_provider(STATE.provider if provider is None else provider)
+    if token is None:
+        token = p.get_token()
+    return p, None if device is None else _as_device(device), token
 
 
 def set_token(
@@ -198,55 +488,37 @@ def set_token(
     :rtype: Dict[str, Any]
     """
     global saved_token
-    homedir = os.path.expanduser("~")
-    authpath = os.path.join(homedir, ".tc.auth.json")
     # provider, device = _preprocess(provider, device)
     if clear is True:
         saved_token = {}
+    saved_token = _ensure_tokens_loaded()
     if token is None:
-        if cached and os.path.exists(authpath):
-            try:
-                with open(authpath, "r") as f:
-                    file_token = json.load(f)
-                    file_token = {k: b64decode_s(v) for k, v in file_token.items()}
-                    # file_token = backend.tree_map(b64decode_s, file_token)
-            except json.JSONDecodeError:
-                logger.warning("token file loading failure, set empty token instead")
-                # TODO(@refraction-ray): better conflict solve with multiprocessing
-                file_token = {}
-        else:
-            file_token = {}
-        file_token.update(saved_token)
-        saved_token = file_token
+        if cached:
+            # tokens in memory take precedence over the ones on the disk
+            for k, v in _load_tokens().items():
+                saved_token.setdefault(k, v)
     else:  # with token
-        if isinstance(provider, str):
-            provider = Provider.from_name(provider)
+        if provider is not None:
+            provider = _as_provider(provider)
         if device is None:
             if provider is None:
-                provider = default_provider
-            added_token = {provider.name + sep: token}
+                provider = STATE.provider
+            key = provider.name + sep
         else:
-            device = Device.from_name(device)
+            device = _as_device(device)
             if provider is None:
                 provider = device.provider  # type: ignore
             if provider is None:
-                provider = default_provider
-            added_token = {provider.name + sep + device.name: token}  # type: ignore
-        saved_token.update(added_token)
+                provider = STATE.provider
+            key = provider.name + sep + device.name  # type: ignore
+        saved_token[key] = token
 
-    if cached:
-        # file_token = backend.tree_map(b64encode_s, saved_token)
-        file_token = {k: b64encode_s(v) for k, v in saved_token.items()}
-        if file_token:
-            with open(authpath, "w") as f:
-                json.dump(file_token, f)
+    if cached and saved_token and saved_token != _disk_tokens:
+        _dump_tokens(saved_token)
 
     return saved_token
 
 
-set_token()
-
-
 def get_token(
     provider: Optional[Union[str, Provider]] = None,
     device: Optional[Union[str, Device]] = None,
@@ -263,20 +535,13 @@ def get_token(
     :rtype: Optional[str]
     """
     if provider is None:
-        provider = get_provider()
-    provider = Provider.from_name(provider)
+        provider = STATE.provider
+    provider = _as_provider(provider)
     target = provider.name + sep
     if device is not None:
-        device = Device.from_name(device, provider)
+        device = _as_device(device, provider)
         target = target + device.name
-    for k, v in saved_token.items():
-        if k == target:
-            return v  # type: ignore
-    return None
-
-
-# token json structure
-# {"tencent::": token1, "tencent::20xmon":  token2}
+    return _ensure_tokens_loaded().get(target)
 
 
 def list_devices(
@@ -294,17 +559,9 @@ def list_devices(
     :return: _description_
     :rtype: Any
     """
-    if provider is None:
-        provider = default_provider
-    provider = Provider.from_name(provider)
-    if token is None:
-        token = provider.get_token()
-    if provider.name == "tencent":
-        return tencent.list_devices(token, **kws)  # type: ignore
-    elif provider.name == "local":
-        return local.list_devices(token, **kws)
-    else:
-        raise ValueError("Unsupported provider: %s" % provider.name)
+    provider, _, token = _resolve(provider, token=token, require_device=False)
+    devices: List[Device] = _backend_method(provider, "list_devices")(token, **kws)
+    return devices
 
 
 def list_properties(
@@ -331,16 +588,11 @@ def list_properties(
     # device = Device.from_name(device, provider)
     # if provider is None:
     #     provider = device.provider
-    provider, device = _preprocess(provider, device)
-
-    if token is None:
-        token = device.get_token()  # type: ignore
-    if provider.name == "tencent":  # type: ignore
-        return tencent.list_properties(device, token)  # type: ignore
-    elif provider.name == "local":
-        raise ValueError("Unsupported method for local backend")
-    else:
-        raise ValueError("Unsupported provider: %s" % provider.name)  # type: ignore
+    provider, device, token = _resolve(provider, device, token)
+    properties: Dict[str, Any] = _backend_method(provider, "list_properties")(
+        device, token
+    )
+    return properties
 
 
 def get_task(
@@ -363,10 +615,13 @@ def get_task(
     if provider is not None and device is None:
         provider, device = None, provider
     if device is not None:  # device can be None for identify tasks
-        device = Device.from_name(device, provider)
-    elif len(taskid.split(sep2)) > 1:
-        device = Device(taskid.split(sep2)[0])
-        taskid = taskid.split(sep2)[1]
+        device = _as_device(device, provider)
+    else:
+        device_name, found, task_name = taskid.partition(sep2)
+        if found:
+            # a provider prefix in ``device_name`` takes precedence over the default
+            device = _as_device(device_name, STATE.provider)
+            taskid = task_name
     return Task(taskid, device=device)
 
 
@@ -393,20 +648,13 @@ def get_task_details(
     if task.device is not None:
         device = task.device
     else:
-        device = default_device
+        device = STATE.device
     if token is None:
         token = device.get_token()
     provider = device.provider
-
-    if provider.name == "tencent":
-        return tencent.get_task_details(task, device, token, prettify)  # type: ignore
-    elif provider.name == "local":
-        return local.get_task_details(task, device, token, prettify)  # type: ignore
-    elif provider.name == "quafu":
-        return quafu_provider.get_task_details(task, device, token, prettify)  # type: ignore
-
-    else:
-        raise ValueError("Unsupported provider: %s" % provider.name)  # type: ignore
+    return _backend_method(provider, "get_task_details")(  # type: ignore
+        task, device, token, prettify
+    )
 
 
 def submit_task(
@@ -446,18 +694,11 @@ def submit_task(
     #         device = Device(device, provider)
     # if provider is None:
     #     provider = device.provider
-    provider, device = _preprocess(provider, device)
-
-    if token is None:
-        token = device.get_token()  # type: ignore
-    if provider.name == "tencent":  # type: ignore
-        return tencent.submit_task(device, token, **task_kws)  # type: ignore
-    elif provider.name == "local":  # type: ignore
-        return local.submit_task(device, token, **task_kws)  # type: ignore
-    elif provider.name == "quafu":  # type: ignore
-        return quafu_provider.submit_task(device, token, **task_kws)  # type: ignore
-    else:
-        raise ValueError("Unsupported provider: %s" % provider.name)  # type: ignore
+    provider, device, token = _resolve(provider, device, token)
+    tasks: List[Task] = _backend_method(provider, "submit_task")(
+        device, token, **task_kws
+    )
+    return tasks
 
 
 def resubmit_task(
@@ -480,13 +721,7 @@ def resubmit_task(
     if token is None:
         token = device.get_token()
     provider = device.provider
-
-    if provider.name == "tencent":  # type: ignore
-        return tencent.resubmit_task(task, token)  # type: ignore
-    elif provider.name == "local":
-        raise ValueError("Unsupported method for local backend")
-    else:
-        raise ValueError("Unsupported provider: %s" % provider.name)  # type: ignore
+    return _backend_method(provider, "resubmit_task")(task, token)  # type: ignore
 
 
 def remove_task(
@@ -499,13 +734,7 @@ def remove_task(
     if token is None:
         token = device.get_token()
     provider = device.provider
-
-    if provider.name == "tencent":  # type: ignore
-        return tencent.remove_task(task, token)  # type: ignore
-    elif provider.name == "local":
-        raise ValueError("Unsupported method for local backend")
-    else:
-        raise ValueError("Unsupported provider: %s" % provider.name)  # type: ignore
+    return _backend_method(provider, "remove_task")(task, token)  # type: ignore
 
 
 def list_tasks(
@@ -526,16 +755,8 @@ def list_tasks(
     :return: list of task object that satisfy these filter criteria
     :rtype: List[Task]
     """
-    if provider is None:
-        provider = default_provider
-    provider = Provider.from_name(provider)
-    if token is None:
-        token = provider.get_token()  # type: ignore
-    if device is not None:
-        device = Device.from_name(device)
-    if provider.name == "tencent":  # type: ignore
-        return tencent.list_tasks(device, token, **filter_kws)  # type: ignore
-    elif provider.name == "local":  # type: ignore
-        return local.list_tasks(device, token, **filter_kws)  # type: ignore
-    else:
-        raise ValueError("Unsupported provider: %s" % provider.name)  # type: ignore
+    provider, device, token = _resolve(provider, device, token, require_device=False)
+    tasks: List[Task] = _backend_method(provider, "list_tasks")(
+        device, token, **filter_kws
+    )
+    return tasks
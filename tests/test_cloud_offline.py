@@ -0,0 +1,95 @@
+import json
+import os
+from base64 import b64encode
+
+import pytest
+
+from tensorcircuit.cloud import apis
+
+
+@pytest.fixture(scope="function")
+def tmp_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    monkeypatch.setattr(apis, "_disk_tokens", None)
+    # force lazy token loading from the temporary home
+    old_token = vars(apis).pop("saved_token", None)
+    yield tmp_path
+    vars(apis).pop("saved_token", None)
+    if old_token is not None:
+        apis.saved_token = old_token
+
+
+def _reset_tokens():
+    vars(apis).pop("saved_token", None)
+
+
+def test_legacy_token_file(tmp_home):
+    legacy = {"local::": b64encode(b"abc").decode(), "local::testing": "ZGV2"}
+    legacy_path = tmp_home / ".tc.auth.json"
+    legacy_path.write_text(json.dumps(legacy))
+    assert apis.get_token("local") == "abc"
+    assert apis.get_token("local", "testing") == "dev"
+    # legacy file is left intact for older installations
+    assert json.loads(legacy_path.read_text()) == legacy
+    assert not os.path.exists(tmp_home / ".tc.auth.v2.json")
+
+    apis.set_token("xyz", provider="tencent")
+    assert json.loads(legacy_path.read_text()) == legacy
+    content = json.loads((tmp_home / ".tc.auth.v2.json").read_text())
+    assert content["version"] == 2
+    assert content["tokens"] == {
+        "local::": "abc",
+        "local::testing": "dev",
+        "tencent::": "xyz",
+    }
+
+
+def test_token_round_trip(tmp_home):
+    apis.set_token("abc", provider="local")
+    apis.set_token("dev", device="local::testing")
+    content = json.loads((tmp_home / ".tc.auth.v2.json").read_text())
+    assert content == {
+        "version": 2,
+        "tokens": {"local::": "abc", "local::testing": "dev"},
+    }
+    _reset_tokens()
+    assert apis.get_token("local") == "abc"
+    assert apis.get_device("local::testing").get_token() == "dev"
+
+
+def test_token_file_invalid(tmp_home):
+    path = tmp_home / ".tc.auth.v2.json"
+    path.write_text(json.dumps({"version": 3, "tokens": {"local::": "abc"}}))
+    assert apis.get_token("local") is None
+    _reset_tokens()
+    path.write_text(json.dumps({"version": 2}))
+    assert apis.get_token("local") is None
+
+
+def test_token_no_rewrite(tmp_home, monkeypatch):
+    apis.set_token("abc", provider="local")
+    _reset_tokens()
+    dumped = []
+    monkeypatch.setattr(apis, "_dump_tokens", dumped.append)
+    apis.set_token()
+    apis.set_token("abc", provider="local")
+    assert not dumped
+    apis.set_token("def", provider="local")
+    assert dumped == [{"local::": "def"}]
+
+
+def test_local_unsupported_method(tmp_home):
+    with pytest.raises(ValueError):
+        apis.list_properties("local::x")
+    with pytest.raises(ValueError):
+        apis.list_devices(provider="unknown")
+
+
+def test_token_dump_failure(tmp_home):
+    apis.set_token("abc", provider="local")
+    with pytest.raises(TypeError):
+        apis.set_token(object(), provider="tencent")
+    assert sorted(os.listdir(tmp_home)) == [".tc.auth.v2.json"]
+    _reset_tokens()
+    assert apis.get_token("local") == "abc"
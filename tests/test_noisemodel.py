@@ -11,6 +11,9 @@ from tensorcircuit.noisemodel import (
 )
 from tensorcircuit.channels import composedkraus
 
+# readout error of qubit 0 and qubit 1, backend independent and shared by tests
+readout_error = [[0.9, 0.75], [0.4, 0.7]]
+
 
 @pytest.mark.parametrize("backend", [lf("tfb"), lf("jaxb")])
 def test_noisemodel(backend):
@@ -43,10 +46,6 @@ def test_noisemodel(backend):
     error2 = tc.channels.generaldepolarizingchannel(0.01, 2)
     error3 = tc.channels.thermalrelaxationchannel(300, 400, 100, "ByChoi", 0)
 
-    readout_error = []
-    readout_error.append([0.9, 0.75])  # readout error of qubit 0
-    readout_error.append([0.4, 0.7])  # readout error of qubit 1
-
     noise_conf = NoiseConf()
     noise_conf.add_noise("rx", error1)
     noise_conf.add_noise("rx", [error3], [[0]])
@@ -65,11 +64,12 @@ def test_noisemodel(backend):
     # np.testing.assert_allclose(value, 0.09, atol=1e-1)
 
     # with readout_error
-    value = sample_expectation_ps_noisfy(dmc, x=[0, 1], noise_conf=noise_conf)
-    np.testing.assert_allclose(value, -0.12, atol=1e-2)
+    value_dm = sample_expectation_ps_noisfy(dmc, x=[0, 1], noise_conf=noise_conf)
+    np.testing.assert_allclose(value_dm, -0.12, atol=1e-2)
 
-    value = sample_expectation_ps_noisfy(c, x=[0, 1], noise_conf=noise_conf, nmc=100000)
-    np.testing.assert_allclose(value, -0.12, atol=1e-2)
+    # Monte Carlo estimation checked against the exact density matrix result
+    value = sample_expectation_ps_noisfy(c, x=[0, 1], noise_conf=noise_conf, nmc=20000)
+    np.testing.assert_allclose(value, value_dm, atol=1e-2)
 
     # test composed channel and general condition
     newerror = composedkraus(error1, error3)
@@ -84,8 +84,8 @@ def test_noisemodel(backend):
     noise_conf1.add_noise_by_condition(condition, error2)
     noise_conf1.add_noise("readout", readout_error)
 
-    value = sample_expectation_ps_noisfy(dmc, x=[0, 1], noise_conf=noise_conf1)
-    np.testing.assert_allclose(value, -0.12, atol=1e-2)
+    value_dm1 = sample_expectation_ps_noisfy(dmc, x=[0, 1], noise_conf=noise_conf1)
+    np.testing.assert_allclose(value_dm1, -0.12, atol=1e-2)
 
     # test standardized gate
     newerror = composedkraus(error1, error3)
@@ -96,10 +96,8 @@ def test_noisemodel(backend):
     noise_conf2.add_noise("cx", [error2], [[0, 1]])
     noise_conf2.add_noise("readout", readout_error)
 
-    value = sample_expectation_ps_noisfy(
-        c, x=[0, 1], noise_conf=noise_conf2, nmc=100000
-    )
-    np.testing.assert_allclose(value, -0.12, atol=1e-2)
+    value = sample_expectation_ps_noisfy(c, x=[0, 1], noise_conf=noise_conf2, nmc=20000)
+    np.testing.assert_allclose(value, value_dm1, atol=1e-2)
 
 
 @pytest.mark.parametrize("backend", [lf("tfb"), lf("jaxb")])
@@ -122,10 +120,6 @@ def test_general_noisemodel(backend):
     error2 = tc.channels.generaldepolarizingchannel(0.06, 2)
     error3 = tc.channels.thermalrelaxationchannel(300, 400, 100, "ByChoi", 0)
 
-    readout_error = []
-    readout_error.append([0.9, 0.75])
-    readout_error.append([0.4, 0.7])
-
     noise_conf = NoiseConf()
     noise_conf.add_noise("rx", error1)
     noise_conf.add_noise("rx", [error3], [[0]])
@@ -134,7 +128,7 @@ def test_general_noisemodel(backend):
     noise_conf.add_noise("cnot", [error2], [[0, 1]])
     noise_conf.add_noise("readout", readout_error)
 
-    nmc = 100000
+    nmc = 20000
     # # test sample_expectation_ps
     value1 = sample_expectation_ps_noisfy(c, x=[0, 1], noise_conf=noise_conf, nmc=nmc)
     value2 = c.sample_expectation_ps(x=[0, 1], noise_conf=noise_conf, nmc=nmc)